@@ -1,69 +1,33 @@
 import streamlit as st
-import numpy as np
 import librosa
-import soundfile as sf
-from transformers import pipeline
-import tempfile
-from scipy.io import wavfile
-from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
+from utils import (
+    MAX_AUDIO_SECONDS, WHISPER_SR, analyze_audio, analyze_text_emotion,
+    combine_results, load_audio, load_speech_to_text_model,
+)
+from live_backends import get_live_backend
 
 # -----------------------------
-# Helper Functions
+# Streamlit App
 # -----------------------------
-def extract_audio_features(audio, sr):
-    energy = np.mean(librosa.feature.rms(y=audio))
-    pitch = np.mean(librosa.yin(audio, fmin=50, fmax=300))
-    centroid = np.mean(librosa.feature.spectral_centroid(y=audio, sr=sr))
-    return np.array([pitch, energy, centroid])
-
-@st.cache_resource
-def load_text_model():
-    return pipeline("text-classification", model="j-hartmann/emotion-english-distilroberta-base")
-
-@st.cache_resource
-def load_speech_to_text_model():
-    return pipeline("automatic-speech-recognition", model="openai/whisper-tiny")
-
-def speech_to_text(audio_path):
-    """Convert speech to text using Whisper ASR."""
-    asr = load_speech_to_text_model()
-    try:
-        result = asr(audio_path)
-        return result["text"].strip()
-    except Exception as e:
-        st.error(f"Speech recognition failed: {e}")
-        return ""
+st.set_page_config(page_title="🎭 Emotion Detector", layout="centered")
+st.title("🎭 Emotion Detection from Audio + Text")
 
-def analyze_text_emotion(text):
-    if not text.strip():
-        return "neutral", 0.0
-    classifier = load_text_model()
-    result = classifier(text)[0]
-    return result['label'].lower(), result['score']
+# Materialize the ASR model during the initial script run so the first
+# audio analysis doesn't pay the load cost. The text model is loaded
+# lazily on the first non-trivial text.
+load_speech_to_text_model()
 
-def combine_results(audio_feats, text_label, text_conf):
-    pitch, energy, centroid = audio_feats
-    if energy < 0.02 and pitch < 100:
-        audio_emotion = "sad"
-    elif pitch > 200 and energy > 0.05:
-        audio_emotion = "happy"
-    elif energy > 0.04 and pitch < 150:
-        audio_emotion = "angry"
-    else:
-        audio_emotion = "neutral"
+CLIP_NOTICE = f"Audio is longer than {MAX_AUDIO_SECONDS} s; only the last {MAX_AUDIO_SECONDS} s are analyzed."
 
-    if text_conf > 0.7:
-        final_emotion = text_label
-    else:
-        final_emotion = audio_emotion if energy > 0.03 else text_label
+def show_audio_analysis(audio, sr):
+    # Each input path has already clipped audio to MAX_AUDIO_SECONDS
+    audio_feats, text, text_label, text_conf = analyze_audio(audio, sr)
+    st.write("🗣️ Detected Speech:", text or "(No speech detected)")
 
-    return audio_emotion, final_emotion
+    audio_emotion, final_emotion = combine_results(audio_feats, text_label, text_conf)
 
-# -----------------------------
-# Streamlit App
-# -----------------------------
-st.set_page_config(page_title="🎭 Emotion Detector", layout="centered")
-st.title("🎭 Emotion Detection from Audio + Text")
+    st.write(f"🎧 Audio Emotion: **{audio_emotion}**")
+    st.success(f"💡 Final Detected Emotion: **{final_emotion}**")
 
 option = st.radio("Choose input type:", ["Text", "Audio Upload", "🎤 Live Audio"])
 
@@ -81,56 +45,24 @@ elif option == "Audio Upload":
 
     if audio_file is not None:
         st.audio(audio_file)
-        audio, sr = librosa.load(audio_file, sr=22050)
-        sf.write("temp.wav", audio, sr)
-
-        audio_feats = extract_audio_features(audio, sr)
-        text = speech_to_text("temp.wav")
-        st.write("🗣️ Detected Speech:", text or "(No speech detected)")
-
-        text_label, text_conf = analyze_text_emotion(text)
-        audio_emotion, final_emotion = combine_results(audio_feats, text_label, text_conf)
-
-        st.write(f"🎧 Audio Emotion: **{audio_emotion}**")
-        st.success(f"💡 Final Detected Emotion: **{final_emotion}**")
+        # Load at Whisper's native rate so features and ASR share one buffer
+        audio, sr, clipped = load_audio(audio_file)
+        if clipped:
+            st.info(CLIP_NOTICE)
+        show_audio_analysis(audio, sr)
 
 # ---------- LIVE AUDIO ----------
 else:
     st.info("Click below to record your voice 🎙️")
 
-    # WebRTC Audio Processor
-    class AudioProcessor(AudioProcessorBase):
-        def __init__(self):
-            self.audio_frames = []
-
-        def recv(self, frame):
-            audio = frame.to_ndarray()
-            self.audio_frames.append(audio)
-            return frame
-
-    webrtc_ctx = webrtc_streamer(
-        key="live-audio",
-        mode=WebRtcMode.SENDONLY,
-        audio_processor_factory=AudioProcessor,
-        media_stream_constraints={"audio": True, "video": False},
-        async_processing=True,
-    )
-
-    if webrtc_ctx.audio_processor:
-        if st.button("Analyze Recorded Audio"):
-            # Combine audio frames
-            audio_frames = np.concatenate(webrtc_ctx.audio_processor.audio_frames, axis=0)
-            # Save to temp WAV
-            tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-            wavfile.write(tmpfile.name, 44100, audio_frames.astype(np.int16))
-            st.audio(tmpfile.name, format="audio/wav")
-
-            audio_feats = extract_audio_features(audio_frames.astype(np.float32)/32768, 44100)
-            text = speech_to_text(tmpfile.name)
-            st.write("🗣️ Detected Speech:", text or "(No speech detected)")
-
-            text_label, text_conf = analyze_text_emotion(text)
-            audio_emotion, final_emotion = combine_results(audio_feats, text_label, text_conf)
-
-            st.write(f"🎧 Audio Emotion: **{audio_emotion}**")
-            st.success(f"💡 Final Detected Emotion: **{final_emotion}**")
+    recording = get_live_backend()()
+    if recording is not None:
+        # Already bounded to the last MAX_AUDIO_SECONDS by the backend, so
+        # playback and resampling cost stay flat
+        audio, device_sr, clipped = recording
+        if clipped:
+            st.info(CLIP_NOTICE)
+        st.audio(audio, sample_rate=device_sr)
+        # Resample once; features and ASR both use the 16 kHz buffer
+        audio = librosa.resample(audio, orig_sr=device_sr, target_sr=WHISPER_SR)
+        show_audio_analysis(audio, WHISPER_SR)
@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import deque
+import numpy as np
+import streamlit as st
+from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
+from utils import MAX_AUDIO_SECONDS, clip_to_tail
+
+# -----------------------------
+# Live Audio Backends
+# -----------------------------
+# Each backend renders its own recording widgets and returns
+# (audio, sr, clipped) once a recording is ready to analyze, or None
+# otherwise. audio is a mono float32 array in [-1, 1] at the device's sample
+# rate, holding at most the last MAX_AUDIO_SECONDS; clipped says whether
+# older audio was dropped.
+
+class AudioProcessor(AudioProcessorBase):
+    def __init__(self):
+        # FIFO of mono frames holding roughly the last MAX_AUDIO_SECONDS;
+        # recv runs on the WebRTC worker thread, hence the lock
+        self.audio_frames = deque()
+        self.n_samples = 0
+        self.clipped = False
+        self.sample_rate = 48000
+        self.lock = threading.Lock()
+
+    def recv(self, frame):
+        # Downmix each frame to mono float in [-1, 1] as it arrives; float
+        # formats (e.g. fltp) are already in range, only integers need scaling
+        pcm = frame.to_ndarray()
+        if np.issubdtype(pcm.dtype, np.integer):
+            pcm = pcm.astype(np.float32) / (np.iinfo(pcm.dtype).max + 1)
+        else:
+            pcm = pcm.astype(np.float32)
+        if frame.format.is_planar:
+            pcm = pcm.mean(axis=0)
+        else:
+            pcm = pcm.reshape(-1, len(frame.layout.channels)).mean(axis=1)
+        max_samples = MAX_AUDIO_SECONDS * frame.sample_rate
+        with self.lock:
+            self.sample_rate = frame.sample_rate
+            self.audio_frames.append(pcm)
+            self.n_samples += pcm.size
+            # Drop whole frames from the head while the rest still covers the window
+            while self.n_samples - self.audio_frames[0].size >= max_samples:
+                self.n_samples -= self.audio_frames.popleft().size
+                self.clipped = True
+        return frame
+
+    def take(self):
+        """Return (audio, sr, clipped) for the buffered recording and reset
+        the buffer, or None if nothing has arrived yet."""
+        with self.lock:
+            if not self.audio_frames:
+                return None
+            frames, sr = list(self.audio_frames), self.sample_rate
+            clipped = self.clipped or self.n_samples > MAX_AUDIO_SECONDS * sr
+            self.audio_frames.clear()
+            self.n_samples = 0
+            self.clipped = False
+        return clip_to_tail(np.concatenate(frames), sr), sr, clipped
+
+def record_webrtc():
+    """Record from the browser microphone over WebRTC."""
+    webrtc_ctx = webrtc_streamer(
+        key="live-audio",
+        mode=WebRtcMode.SENDONLY,
+        audio_processor_factory=AudioProcessor,
+        media_stream_constraints={"audio": True, "video": False},
+        async_processing=True,
+    )
+
+    if webrtc_ctx.audio_processor and st.button("Analyze Recorded Audio"):
+        recording = webrtc_ctx.audio_processor.take()
+        if recording is None:
+            st.warning("No audio received yet; speak for a moment and try again.")
+        return recording
+    return None
+
+LIVE_BACKENDS = {
+    "webrtc": record_webrtc,
+}
+
+def get_live_backend():
+    """Backend chosen by the EMOTION_LIVE_BACKEND env var (default: webrtc).
+
+    Unknown names fall back to webrtc with a warning.
+    """
+    name = os.environ.get("EMOTION_LIVE_BACKEND", "webrtc")
+    if name not in LIVE_BACKENDS:
+        st.warning(f"Unknown EMOTION_LIVE_BACKEND '{name}'; choose one of "
+                   f"{', '.join(LIVE_BACKENDS)}. Falling back to 'webrtc'.")
+        name = "webrtc"
+    return LIVE_BACKENDS[name]
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+import numpy as np
+from transformers import AutoTokenizer
+from faster_whisper import WhisperModel
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTOptimizer, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+
+# -----------------------------
+# Shared model loaders
+# -----------------------------
+TEXT_MODEL_ID = "j-hartmann/emotion-english-distilroberta-base"
+# Keyed by model id so a model switch never reuses a stale export
+ONNX_MODEL_DIR = os.path.join(".onnx_cache", TEXT_MODEL_ID.replace("/", "--"))
+ONNX_CACHE_DIR = os.path.join(ONNX_MODEL_DIR, "int8")
+QUANTIZED_FILE = "model_quantized.onnx"
+
+def load_quantized_text_model():
+    """Export the text-emotion model to ONNX, fuse its transformer ops and apply
+    dynamic int8 quantization.
+
+    The quantized model is written to ONNX_CACHE_DIR and reused on later runs.
+    The export is built in a scratch directory and moved into place only once
+    complete, so an interrupted export never leaves a cache that looks valid.
+    """
+    if not os.path.isfile(os.path.join(ONNX_CACHE_DIR, QUANTIZED_FILE)):
+        os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="export-", dir=ONNX_MODEL_DIR)
+        try:
+            onnx_dir = os.path.join(work_dir, "fp32")
+            int8_dir = os.path.join(work_dir, "int8")
+            model = ORTModelForSequenceClassification.from_pretrained(TEXT_MODEL_ID, export=True)
+            model.save_pretrained(onnx_dir)
+            # Attention / LayerNorm / GELU fusion; level 2 keeps the graph hardware-independent
+            optimizer = ORTOptimizer.from_pretrained(model)
+            optimizer.optimize(save_dir=onnx_dir, optimization_config=OptimizationConfig(optimization_level=2))
+            quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name="model_optimized.onnx")
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=int8_dir, quantization_config=qconfig)
+            # Clear any partial cache left by an older, interrupted export
+            shutil.rmtree(ONNX_CACHE_DIR, ignore_errors=True)
+            os.replace(int8_dir, ONNX_CACHE_DIR)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return ORTModelForSequenceClassification.from_pretrained(ONNX_CACHE_DIR, file_name=QUANTIZED_FILE)
+
+# Longest input the classifier sees; inputs are truncated, never padded
+TEXT_MAX_LENGTH = 64
+
+@lru_cache(maxsize=1)
+def get_text_tokenizer():
+    """Process-wide tokenizer for the text-emotion model."""
+    return AutoTokenizer.from_pretrained(TEXT_MODEL_ID)
+
+@lru_cache(maxsize=1)
+def get_text_classifier():
+    """Process-wide text-emotion classifier, warmed up with one dummy call."""
+    model = load_quantized_text_model()
+    model(**get_text_tokenizer()("warm up", return_tensors="np"))
+    return model
+
+@lru_cache(maxsize=1)
+def get_asr():
+    """Process-wide faster-whisper ASR model, warmed up with one dummy call."""
+    asr = WhisperModel("tiny", device="cpu", compute_type="int8",
+                       cpu_threads=max(1, (os.cpu_count() or 1) - 1))
+    # VAD would drop the silent clip before decoding, so disable it here
+    segments, _ = asr.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1, vad_filter=False)
+    list(segments)
+    return asr
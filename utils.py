@@ -0,0 +1,156 @@
+import streamlit as st
+import numpy as np
+import librosa
+import numba
+import pyworld as pw
+import soundfile as sf
+from concurrent.futures import ThreadPoolExecutor
+from models import TEXT_MAX_LENGTH, get_asr, get_text_classifier, get_text_tokenizer
+
+# -----------------------------
+# Helper Functions
+# -----------------------------
+AUDIO_EMOTIONS = ("sad", "happy", "angry", "neutral")
+
+FRAME_PERIOD_MS = 10.0
+VOICED_RMS = 0.01
+
+@numba.njit(cache=True, fastmath=True)
+def reduce_frames(f0_frames, rms_frames, voiced_rms):
+    """Reduce per-frame tracks to (voiced mean pitch, mean energy).
+
+    Both tracks share one frame grid; pitch is averaged only over frames that
+    are voiced and loud enough, so noise-floor F0 estimates are ignored.
+    """
+    n_f0 = f0_frames.size
+    s_p = 0.0
+    n_voiced = 0
+    s_e = 0.0
+    for i in range(rms_frames.size):
+        s_e += rms_frames[i]
+        if i < n_f0 and f0_frames[i] > 0 and rms_frames[i] > voiced_rms:
+            s_p += f0_frames[i]
+            n_voiced += 1
+    pitch = s_p / n_voiced if n_voiced > 0 else 0.0
+    return pitch, s_e / rms_frames.size
+
+@numba.njit(cache=True)
+def classify_audio(pitch, energy):
+    """Rule-based audio emotion; returns an index into AUDIO_EMOTIONS."""
+    if energy < 0.02 and pitch < 100:
+        return 0
+    elif pitch > 200 and energy > 0.05:
+        return 1
+    elif energy > 0.04 and pitch < 150:
+        return 2
+    return 3
+
+def extract_audio_features(audio, sr):
+    # RMS on the same hop as the pitch track so the two line up frame by frame
+    hop_length = int(sr * FRAME_PERIOD_MS / 1000)
+    rms = librosa.feature.rms(y=audio, frame_length=2 * hop_length, hop_length=hop_length)[0]
+    # DIO + StoneMask is much faster than YIN
+    x = audio.astype(np.float64)
+    f0, t = pw.dio(x, sr, f0_floor=50.0, f0_ceil=300.0, frame_period=FRAME_PERIOD_MS)
+    f0 = pw.stonemask(x, f0, t, sr)
+    return np.array(reduce_frames(f0, rms, VOICED_RMS))
+
+@st.cache_resource
+def load_speech_to_text_model():
+    return get_asr()
+
+@st.cache_resource
+def load_text_tokenizer():
+    return get_text_tokenizer()
+
+@st.cache_resource
+def load_text_model():
+    return get_text_classifier()
+
+WHISPER_SR = 16000
+# Whisper's training window; longer inputs are cut to their most recent part
+MAX_AUDIO_SECONDS = 30
+
+def load_audio(source, target_sr=WHISPER_SR, max_seconds=MAX_AUDIO_SECONDS):
+    """Decode the last max_seconds of a WAV and resample it to target_sr as mono float32.
+
+    Reads straight into a preallocated buffer with soundfile, bypassing
+    librosa.load and its slow audioread fallback. Only the tail that will be
+    analyzed is read, so memory stays flat regardless of file length.
+    Returns (audio, sr, clipped) where clipped says whether the file was longer.
+    """
+    with sf.SoundFile(source) as f:
+        file_sr = f.samplerate
+        n_frames = min(f.frames, int(max_seconds * file_sr))
+        clipped = f.frames > n_frames
+        if clipped:
+            f.seek(f.frames - n_frames)
+        audio = np.empty((n_frames, f.channels), dtype=np.float32)
+        f.read(out=audio)
+    audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    if file_sr != target_sr:
+        audio = librosa.resample(audio, orig_sr=file_sr, target_sr=target_sr)
+    return audio, target_sr, clipped
+
+def clip_to_tail(audio, sr, max_seconds=MAX_AUDIO_SECONDS):
+    """Keep only the last max_seconds of audio so ASR cost stays bounded."""
+    max_samples = int(max_seconds * sr)
+    return audio[-max_samples:] if audio.size > max_samples else audio
+
+def speech_to_text(audio, sr):
+    """Convert an in-memory float waveform to text using Whisper ASR (faster-whisper, int8)."""
+    audio = audio.astype(np.float32)
+    if sr != WHISPER_SR:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=WHISPER_SR)
+    try:
+        segments, _ = load_speech_to_text_model().transcribe(audio, beam_size=1, vad_filter=True)
+        return " ".join(s.text for s in segments).strip()
+    except Exception as e:
+        st.error(f"Speech recognition failed: {e}")
+        return ""
+
+def analyze_text_emotion(text):
+    # Single words carry too little context to classify; skip the model
+    # (and its first-use load) for them
+    if not text.strip() or len(text.split()) < 2:
+        return "neutral", 0.0
+    model = load_text_model()
+    # No padding: a single short input only needs its own length
+    enc = load_text_tokenizer()(text, return_tensors="np", truncation=True,
+                                max_length=TEXT_MAX_LENGTH, padding=False)
+    logits = model(**enc).logits[0]
+    # Only the winning class is reported, so skip normalizing the full
+    # distribution: softmax(x)[k] == 1 / sum(exp(x - x[k]))
+    idx = int(logits.argmax())
+    score = 1.0 / float(np.exp(logits - logits[idx]).sum())
+    return model.config.id2label[idx].lower(), score
+
+SILENCE_RMS = 1e-3
+
+def analyze_audio(audio, sr):
+    """Extract acoustic features in a worker thread while ASR and text
+    classification run on the script thread."""
+    # Nothing to analyze in an empty buffer
+    if audio.size == 0:
+        return np.zeros(2), "", "neutral", 0.0
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        f_feat = ex.submit(extract_audio_features, audio, sr)
+        # Skip Whisper entirely on silent buffers
+        if np.sqrt(np.mean(np.square(audio))) < SILENCE_RMS:
+            text, text_label, text_conf = "", "neutral", 0.0
+        else:
+            text = speech_to_text(audio, sr)
+            text_label, text_conf = analyze_text_emotion(text)
+        audio_feats = f_feat.result()
+    return audio_feats, text, text_label, text_conf
+
+def combine_results(audio_feats, text_label, text_conf):
+    pitch, energy = audio_feats[:2]
+    audio_emotion = AUDIO_EMOTIONS[classify_audio(pitch, energy)]
+
+    if text_conf > 0.7:
+        final_emotion = text_label
+    else:
+        final_emotion = audio_emotion if energy > 0.03 else text_label
+
+    return audio_emotion, final_emotion